@@ -0,0 +1,18 @@
+"""Single CLI entry point: ``python -m market_sim`` runs the scenario CLI.
+
+Delegates to simulate.main so the argument parser is built in exactly one
+place.
+"""
+
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if __name__ == "__main__":
+    # simulate.py and the scenario modules import relative to the
+    # market_sim root, which is not on sys.path when run via -m
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+    from simulate import main
+    main()
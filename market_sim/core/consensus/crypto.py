@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Tuple
+from typing import List, Tuple
 
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
 from cryptography.hazmat.primitives import serialization
@@ -28,6 +28,16 @@ def verify_signature(public_key: Ed25519PublicKey, message: bytes, signature: by
         return False
 
 
+def verify_signatures_batch(items: List[Tuple[Ed25519PublicKey, bytes, bytes]]) -> List[bool]:
+    """Verify many (public_key, message, signature) triples in one call.
+
+    Gives callers a single boundary for a whole batch of verifications so the
+    per-signature Python dispatch happens in one tight loop here (and can be
+    swapped for a true libsodium batch verify without touching call sites).
+    """
+    return [verify_signature(pub, msg, sig) for pub, msg, sig in items]
+
+
 def serialize_public_key(public_key: Ed25519PublicKey) -> bytes:
     return public_key.public_bytes(
         encoding=serialization.Encoding.Raw,
@@ -1,207 +1,344 @@
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Tuple
-from hashlib import sha256
-
-from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
-
-from core.consensus.crypto import Ed25519KeyPair, verify_signature, serialize_public_key
-
-
-@dataclass(frozen=True)
-class Block:
-    parent_hash: str
-    epoch: int
-    proposer_id: str
-    payload: bytes = b""
-
-    def hash(self) -> str:
-        m = sha256()
-        m.update(self.parent_hash.encode("utf-8"))
-        m.update(self.epoch.to_bytes(8, "big"))
-        m.update(self.proposer_id.encode("utf-8"))
-        m.update(self.payload)
-        return m.hexdigest()
-
-
-@dataclass
-class Vote:
-    block_hash: str
-    epoch: int
-    voter_id: str
-    signature: bytes
-
-
-@dataclass
-class Notarization:
-    block_hash: str
-    epoch: int
-    voters: Set[str] = field(default_factory=set)
-
-
-@dataclass
-class Node:
-    node_id: str
-    keys: Ed25519KeyPair
-    public_keys: Dict[str, Ed25519PublicKey]
-    f: int
-
-    # local view
-    blocks: Dict[str, Block] = field(default_factory=dict)
-    parent_of: Dict[str, Optional[str]] = field(default_factory=dict)
-    notarized_blocks: Set[str] = field(default_factory=set)
-    votes_seen: Dict[Tuple[str, str], Vote] = field(default_factory=dict)  # (block_hash, voter_id) -> Vote
-    notarizations: Dict[str, Notarization] = field(default_factory=dict)
-    finalized: Set[str] = field(default_factory=set)
-
-    def genesis_hash(self) -> str:
-        return "GENESIS"
-
-    def longest_notarized_chains(self) -> List[List[str]]:
-        # Reconstruct chains ending at notarized tips and keep the longest
-        chains: List[List[str]] = []
-        max_len = 0
-        for bh in self.notarized_blocks:
-            chain = []
-            cur = bh
-            while cur and cur in self.blocks:
-                chain.append(cur)
-                cur = self.parent_of.get(cur)
-            if cur == self.genesis_hash() or cur is None:
-                length = len(chain)
-                if length > max_len:
-                    max_len = length
-                    chains = [list(reversed(chain))]
-                elif length == max_len:
-                    chains.append(list(reversed(chain)))
-        return chains if chains else []
-
-    def get_quorum(self) -> int:
-        return 2 * self.f + 1
-
-    def leader_for_epoch(self, epoch: int, node_ids: List[str]) -> str:
-        # deterministic round-robin
-        return node_ids[epoch % len(node_ids)]
-
-    def propose(self, epoch: int, node_ids: List[str], payload: bytes = b"") -> Optional[Block]:
-        leader = self.leader_for_epoch(epoch, node_ids)
-        if leader != self.node_id:
-            return None
-        # choose parent = tip of any longest notarized chain in local view (or genesis)
-        chains = self.longest_notarized_chains()
-        parent_hash = chains[-1][-1] if chains else self.genesis_hash()
-        blk = Block(parent_hash=parent_hash, epoch=epoch, proposer_id=self.node_id, payload=payload)
-        bh = blk.hash()
-        self.blocks[bh] = blk
-        self.parent_of[bh] = parent_hash if parent_hash != self.genesis_hash() else None
-        return blk
-
-    def sign_vote(self, block_hash: str, epoch: int) -> Vote:
-        msg = f"{block_hash}:{epoch}:{self.node_id}".encode("utf-8")
-        sig = self.keys.sign(msg)
-        return Vote(block_hash=block_hash, epoch=epoch, voter_id=self.node_id, signature=sig)
-
-    def can_vote_for(self, blk: Block) -> bool:
-        # Vote for first proposal seen in epoch iff it extends one of the longest notarized chains seen
-        # and we haven't already voted this epoch
-        if any(k[1] == self.node_id and self.blocks[k[0]].epoch == blk.epoch for k in self.votes_seen.keys() if k[0] in self.blocks):
-            return False
-        if blk.epoch < 0:
-            return False
-        # check it extends a longest notarized chain tip
-        chains = self.longest_notarized_chains()
-        if not chains:
-            # allow any first block extending genesis
-            return blk.parent_hash == self.genesis_hash() or blk.parent_hash not in self.blocks
-        longest_tips = {c[-1] for c in chains}
-        return blk.parent_hash in longest_tips
-
-    def observe_proposal(self, blk: Block) -> Optional[Vote]:
-        bh = blk.hash()
-        self.blocks[bh] = blk
-        self.parent_of[bh] = blk.parent_hash if blk.parent_hash != self.genesis_hash() else None
-        if self.can_vote_for(blk):
-            vote = self.sign_vote(bh, blk.epoch)
-            self.votes_seen[(bh, self.node_id)] = vote
-            return vote
-        return None
-
-    def observe_vote(self, vote: Vote) -> Optional[Notarization]:
-        # Verify signature
-        pub = self.public_keys.get(vote.voter_id)
-        if not pub:
-            return None
-        msg = f"{vote.block_hash}:{vote.epoch}:{vote.voter_id}".encode("utf-8")
-        if not verify_signature(pub, msg, vote.signature):
-            return None
-        # Track vote
-        key = (vote.block_hash, vote.voter_id)
-        if key in self.votes_seen:
-            return None
-        self.votes_seen[key] = vote
-        # Aggregate notarization
-        notz = self.notarizations.get(vote.block_hash)
-        if not notz:
-            notz = Notarization(block_hash=vote.block_hash, epoch=vote.epoch, voters=set())
-            self.notarizations[vote.block_hash] = notz
-        notz.voters.add(vote.voter_id)
-        if len(notz.voters) >= self.get_quorum():
-            self.notarized_blocks.add(vote.block_hash)
-            self._try_finalize(vote.block_hash)
-            return notz
-        return None
-
-    def _try_finalize(self, tip_hash: str) -> None:
-        # Finalize the middle of three consecutive notarized blocks in a notarized chain
-        # Walk back from tip to gather three consecutive epochs
-        chain: List[str] = []
-        cur = tip_hash
-        while cur in self.blocks and len(chain) < 3:
-            if cur not in self.notarized_blocks:
-                return
-            chain.append(cur)
-            cur = self.parent_of.get(cur)
-        if len(chain) < 3:
-            return
-        b3, b2, b1 = chain  # b3 newest
-        blk3, blk2, blk1 = self.blocks[b3], self.blocks[b2], self.blocks[b1]
-        if blk3.epoch == blk2.epoch + 1 and blk2.epoch == blk1.epoch + 1:
-            # finalize b2 and its ancestors
-            cur = b2
-            while cur is not None and cur in self.blocks and cur not in self.finalized:
-                self.finalized.add(cur)
-                cur = self.parent_of.get(cur)
-
-
-class StreamletNetwork:
-    def __init__(self, node_ids: List[str], f: int = 1):
-        self.node_ids = node_ids
-        self.f = f
-        self.nodes: Dict[str, Node] = {}
-        # key distribution
-        keypairs: Dict[str, Ed25519KeyPair] = {nid: Ed25519KeyPair.generate() for nid in node_ids}
-        pubs = {nid: kp.public_key for nid, kp in keypairs.items()}
-        for nid in node_ids:
-            self.nodes[nid] = Node(node_id=nid, keys=keypairs[nid], public_keys=pubs, f=f)
-
-    def step_epoch(self, epoch: int, payload: bytes = b"") -> None:
-        leader = self.node_ids[epoch % len(self.node_ids)]
-        proposal = self.nodes[leader].propose(epoch, self.node_ids, payload)
-        if not proposal:
-            return
-        # broadcast proposal and gather votes
-        votes: List[Vote] = []
-        for nid, node in self.nodes.items():
-            vote = node.observe_proposal(proposal)
-            if vote:
-                votes.append(vote)
-        # broadcast votes
-        for vote in votes:
-            for node in self.nodes.values():
-                node.observe_vote(vote)
-
-    def finalized_by_all(self) -> Set[str]:
-        common = None
-        for node in self.nodes.values():
-            fs = node.finalized
-            common = fs if common is None else common.intersection(fs)
-        return common or set() 
\ No newline at end of file
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+from hashlib import sha256
+
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+
+from core.consensus.crypto import Ed25519KeyPair, verify_signature, verify_signatures_batch, serialize_public_key
+
+# Shared signature-verification pool, created lazily on the first large
+# batch and shared by every network so instances don't each hold (and
+# leak) an executor. Ed25519 verification in pyca/cryptography releases
+# the GIL, so the checks can actually run concurrently.
+_VERIFY_POOL: Optional[ThreadPoolExecutor] = None
+
+
+def _get_verify_pool() -> ThreadPoolExecutor:
+    global _VERIFY_POOL
+    if _VERIFY_POOL is None:
+        _VERIFY_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+    return _VERIFY_POOL
+
+
+@dataclass(frozen=True, slots=True)
+class Block:
+    parent_hash: bytes
+    epoch: int
+    proposer_id: str
+    payload: bytes = b""
+    # lazily computed digest; declared as a field so it gets a slot
+    _hash: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
+    def hash(self) -> bytes:
+        # Cached on first use: blocks are immutable, so the digest never changes,
+        # and hash() is hit once per node per vote on the hot path. Raw 32-byte
+        # digests make for smaller, faster dict/set keys than hex strings.
+        cached = self._hash
+        if cached is not None:
+            return cached
+        buf = (
+            self.parent_hash
+            + self.epoch.to_bytes(8, "big")
+            + self.proposer_id.encode("utf-8")
+            + self.payload
+        )
+        digest = sha256(buf).digest()
+        object.__setattr__(self, "_hash", digest)
+        return digest
+
+    def hash_hex(self) -> str:
+        """Hex form of the block hash, for display/serialization boundaries."""
+        return self.hash().hex()
+
+
+@dataclass(slots=True)
+class Vote:
+    block_hash: bytes
+    epoch: int
+    voter_id: str
+    signature: bytes
+
+
+@dataclass(slots=True)
+class Notarization:
+    block_hash: bytes
+    epoch: int
+    voters: Set[str] = field(default_factory=set)
+
+
+@dataclass(slots=True)
+class Node:
+    node_id: str
+    keys: Ed25519KeyPair
+    public_keys: Dict[str, Ed25519PublicKey]
+    f: int
+
+    # local view
+    blocks: Dict[bytes, Block] = field(default_factory=dict)
+    parent_of: Dict[bytes, Optional[bytes]] = field(default_factory=dict)
+    notarized_blocks: Set[bytes] = field(default_factory=set)
+    votes_seen: Dict[bytes, Set[str]] = field(default_factory=lambda: defaultdict(set))  # block_hash -> voter_ids
+    notarizations: Dict[bytes, Notarization] = field(default_factory=dict)
+    finalized: Set[bytes] = field(default_factory=set)
+    # incremental chain-length index: blocks are append-only, so depths never
+    # change and the longest notarized tips can be tracked as blocks notarize
+    depth: Dict[bytes, int] = field(default_factory=dict)
+    max_depth: int = 0
+    longest_tips: Set[bytes] = field(default_factory=set)
+    block_epoch: Dict[bytes, int] = field(default_factory=dict)
+    voted_epochs: Set[int] = field(default_factory=set)
+    # invoked with the block hash when this node first finalizes a block
+    on_finalize: Optional[Callable[[bytes], None]] = None
+    # pre-encoded identity strings, filled in by __post_init__
+    _node_id_bytes: bytes = field(init=False, repr=False)
+    _id_bytes: Dict[str, bytes] = field(init=False, repr=False)
+    quorum: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        # Identity strings never change, so encode them once instead of on
+        # every vote sign/verify; same for the quorum threshold.
+        self._node_id_bytes = self.node_id.encode("utf-8")
+        self._id_bytes = {nid: nid.encode("utf-8") for nid in self.public_keys}
+        self.quorum = 2 * self.f + 1
+
+    def genesis_hash(self) -> bytes:
+        return b"GENESIS"
+
+    def _vote_message(self, block_hash: bytes, epoch: int, voter_bytes: bytes) -> bytes:
+        return b"%b:%d:%b" % (block_hash, epoch, voter_bytes)
+
+    def longest_notarized_tips(self) -> Set[bytes]:
+        # O(1): maintained incrementally as blocks become notarized
+        return self.longest_tips
+
+    def longest_notarized_chains(self) -> List[List[bytes]]:
+        # Reconstruct full chains only from the known longest tips
+        chains: List[List[bytes]] = []
+        for bh in self.longest_tips:
+            chain = []
+            cur = bh
+            while cur and cur in self.blocks:
+                chain.append(cur)
+                cur = self.parent_of.get(cur)
+            chains.append(list(reversed(chain)))
+        return chains
+
+    def get_quorum(self) -> int:
+        return self.quorum
+
+    def leader_for_epoch(self, epoch: int, node_ids: Sequence[str]) -> str:
+        # deterministic round-robin
+        return node_ids[epoch % len(node_ids)]
+
+    def propose(self, epoch: int, node_ids: Sequence[str], payload: bytes = b"") -> Optional[Block]:
+        leader = self.leader_for_epoch(epoch, node_ids)
+        if leader != self.node_id:
+            return None
+        # choose parent = tip of any longest notarized chain in local view (or genesis)
+        tips = self.longest_notarized_tips()
+        parent_hash = next(iter(tips)) if tips else self.genesis_hash()
+        blk = Block(parent_hash=parent_hash, epoch=epoch, proposer_id=self.node_id, payload=payload)
+        self._add_block(blk)
+        return blk
+
+    def sign_vote(self, block_hash: bytes, epoch: int) -> Vote:
+        msg = self._vote_message(block_hash, epoch, self._node_id_bytes)
+        sig = self.keys.sign(msg)
+        return Vote(block_hash=block_hash, epoch=epoch, voter_id=self.node_id, signature=sig)
+
+    def can_vote_for(self, blk: Block) -> bool:
+        # Vote for first proposal seen in epoch iff it extends one of the longest notarized chains seen
+        # and we haven't already voted this epoch
+        if blk.epoch in self.voted_epochs:
+            return False
+        if blk.epoch < 0:
+            return False
+        # check it extends a longest notarized chain tip
+        tips = self.longest_notarized_tips()
+        if not tips:
+            # allow any first block extending genesis
+            return blk.parent_hash == self.genesis_hash() or blk.parent_hash not in self.blocks
+        return blk.parent_hash in tips
+
+    def _add_block(self, blk: Block) -> bytes:
+        bh = blk.hash()
+        self.blocks[bh] = blk
+        self.parent_of[bh] = blk.parent_hash if blk.parent_hash != self.genesis_hash() else None
+        self.depth[bh] = self.depth.get(blk.parent_hash, 0) + 1
+        self.block_epoch[bh] = blk.epoch
+        return bh
+
+    def observe_proposal(self, blk: Block) -> Optional[Vote]:
+        bh = self._add_block(blk)
+        if self.can_vote_for(blk):
+            vote = self.sign_vote(bh, blk.epoch)
+            self.votes_seen[bh].add(self.node_id)
+            self.voted_epochs.add(blk.epoch)
+            return vote
+        return None
+
+    def observe_vote(self, vote: Vote) -> Optional[Notarization]:
+        # Verify signature
+        pub = self.public_keys.get(vote.voter_id)
+        if not pub:
+            return None
+        msg = self._vote_message(vote.block_hash, vote.epoch, self._id_bytes[vote.voter_id])
+        if not verify_signature(pub, msg, vote.signature):
+            return None
+        return self._record_vote(vote)
+
+    def observe_votes_batch(self, votes: List[Vote]) -> List[Notarization]:
+        # Verify a whole epoch's worth of votes through one batch boundary,
+        # then apply state updates only for the valid subset.
+        candidates, items = self.vote_check_items(votes)
+        return self.record_verified(candidates, verify_signatures_batch(items))
+
+    def vote_check_items(self, votes: List[Vote]) -> Tuple[List[Vote], List[tuple]]:
+        """Split votes into verifiable candidates and their (pub, msg, sig) items."""
+        candidates: List[Vote] = []
+        items: List[tuple] = []
+        for vote in votes:
+            pub = self.public_keys.get(vote.voter_id)
+            if not pub:
+                continue
+            msg = self._vote_message(vote.block_hash, vote.epoch, self._id_bytes[vote.voter_id])
+            candidates.append(vote)
+            items.append((pub, msg, vote.signature))
+        return candidates, items
+
+    def record_verified(self, candidates: List[Vote], results: List[bool]) -> List[Notarization]:
+        """Apply state updates for votes whose signatures already checked out."""
+        notarizations: List[Notarization] = []
+        for vote, ok in zip(candidates, results):
+            if not ok:
+                continue
+            notz = self._record_vote(vote)
+            if notz:
+                notarizations.append(notz)
+        return notarizations
+
+    def _record_vote(self, vote: Vote) -> Optional[Notarization]:
+        # Track vote (signature already verified)
+        voters_seen = self.votes_seen[vote.block_hash]
+        if vote.voter_id in voters_seen:
+            return None
+        voters_seen.add(vote.voter_id)
+        # Aggregate notarization
+        notz = self.notarizations.get(vote.block_hash)
+        if not notz:
+            notz = Notarization(block_hash=vote.block_hash, epoch=vote.epoch, voters=set())
+            self.notarizations[vote.block_hash] = notz
+        notz.voters.add(vote.voter_id)
+        if len(notz.voters) >= self.quorum:
+            self.notarized_blocks.add(vote.block_hash)
+            # Only blocks in our local view have a depth and can become chain
+            # tips; a quorum of votes for an unknown hash must not poison the
+            # tip set (which would block all future proposals)
+            d = self.depth.get(vote.block_hash)
+            if d is not None:
+                if d > self.max_depth:
+                    self.max_depth = d
+                    self.longest_tips = {vote.block_hash}
+                elif d == self.max_depth:
+                    self.longest_tips.add(vote.block_hash)
+            self._try_finalize(vote.block_hash)
+            return notz
+        return None
+
+    def _try_finalize(self, tip_hash: bytes) -> None:
+        # Finalize the middle of three consecutive notarized blocks in a notarized
+        # chain: check tip, parent and grandparent directly, no list or loop
+        notarized = self.notarized_blocks
+        b3 = tip_hash  # b3 newest
+        if b3 not in notarized:
+            return
+        b2 = self.parent_of.get(b3)
+        if b2 is None or b2 not in notarized:
+            return
+        b1 = self.parent_of.get(b2)
+        if b1 is None or b1 not in notarized:
+            return
+        epochs = self.block_epoch
+        if epochs[b3] == epochs[b2] + 1 and epochs[b2] == epochs[b1] + 1:
+            # finalize b2 and its ancestors
+            cur = b2
+            while cur is not None and cur in self.blocks and cur not in self.finalized:
+                self.finalized.add(cur)
+                if self.on_finalize:
+                    self.on_finalize(cur)
+                cur = self.parent_of.get(cur)
+
+
+class StreamletNetwork:
+    def __init__(self, node_ids: Sequence[str], f: int = 1):
+        # tuple: immutable and faster to index in the per-epoch leader lookup
+        self.node_ids = tuple(node_ids)
+        self.f = f
+        self.nodes: Dict[str, Node] = {}
+        # key distribution
+        keypairs: Dict[str, Ed25519KeyPair] = {nid: Ed25519KeyPair.generate() for nid in node_ids}
+        pubs = {nid: kp.public_key for nid, kp in keypairs.items()}
+        for nid in node_ids:
+            self.nodes[nid] = Node(node_id=nid, keys=keypairs[nid], public_keys=pubs, f=f,
+                                   on_finalize=self._on_node_finalized)
+        # a block is common-finalized once every node has finalized it; track
+        # per-block counts so the set grows incrementally instead of being
+        # recomputed by intersection
+        self._finalize_counts: Dict[bytes, int] = {}
+        self._common_finalized: Set[bytes] = set()
+
+    def _on_node_finalized(self, block_hash: bytes) -> None:
+        count = self._finalize_counts.get(block_hash, 0) + 1
+        self._finalize_counts[block_hash] = count
+        if count == len(self.nodes):
+            self._common_finalized.add(block_hash)
+            self._on_common_finalized(block_hash)
+
+    def _on_common_finalized(self, block_hash: bytes) -> None:
+        # hook for subclasses interested in blocks finalized by every node
+        pass
+
+    def step_epoch(self, epoch: int, payload: bytes = b"") -> Optional[bytes]:
+        """Run one epoch; returns the proposed block's hash, if any."""
+        leader = self.node_ids[epoch % len(self.node_ids)]
+        proposal = self.nodes[leader].propose(epoch, self.node_ids, payload)
+        if not proposal:
+            return None
+        # broadcast proposal and gather votes
+        votes: List[Vote] = []
+        for nid, node in self.nodes.items():
+            vote = node.observe_proposal(proposal)
+            if vote:
+                votes.append(vote)
+        self.broadcast_votes(votes)
+        return proposal.hash()
+
+    # Below this many signature checks the thread-pool fan-out costs more
+    # than it saves (measured ~break-even on a 4-node network), so smaller
+    # batches verify synchronously through the batch boundary.
+    _PARALLEL_VERIFY_MIN = 64
+
+    def broadcast_votes(self, votes: List[Vote]) -> None:
+        # Deliver each node its epoch's votes in one batch instead of one
+        # observe_vote (and one signature verification) call per vote
+        if not votes:
+            return
+        if len(votes) * len(self.nodes) < self._PARALLEL_VERIFY_MIN:
+            for node in self.nodes.values():
+                node.observe_votes_batch(votes)
+            return
+        # large batch: fan the signature checks out across the thread pool
+        per_node = [(node, *node.vote_check_items(votes)) for node in self.nodes.values()]
+        all_items = [item for _, _, items in per_node for item in items]
+        results = list(_get_verify_pool().map(lambda t: verify_signature(*t), all_items))
+        offset = 0
+        for node, candidates, items in per_node:
+            node.record_verified(candidates, results[offset:offset + len(items)])
+            offset += len(items)
+
+    def finalized_by_all(self) -> Set[bytes]:
+        # maintained incrementally via _on_node_finalized; treat as read-only
+        return self._common_finalized 
\ No newline at end of file
@@ -28,7 +28,7 @@ class OrderStatus(Enum):
     CANCELLED = "cancelled"
     REJECTED = "rejected"
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     """Base class for market orders."""
     id: UUID
@@ -84,7 +84,7 @@ class Order:
             agent_id=agent_id
         )
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """Represents a completed trade between two orders."""
     id: UUID
@@ -108,7 +108,7 @@ class Trade:
             timestamp=datetime.utcnow()
         )
 
-@dataclass
+@dataclass(slots=True)
 class OrderBook:
     """Represents the order book for a single symbol."""
     symbol: str
@@ -147,7 +147,7 @@ class OrderBook:
                 del orders[order.price]
         self.last_updated = datetime.utcnow()
 
-@dataclass
+@dataclass(slots=True)
 class Asset:
     """Base class for tradable assets."""
     symbol: str
@@ -158,7 +158,7 @@ class Asset:
     max_trade_size: Optional[Decimal]
     tick_size: Decimal
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Represents a trading position."""
     agent_id: str
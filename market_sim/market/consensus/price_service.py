@@ -1,185 +1,241 @@
-"""
-Price consensus service for stock market Streamlet implementation.
-"""
-
-import json
-import random
-from datetime import datetime, timedelta
-from decimal import Decimal
-from typing import List, Dict, Optional
-from dataclasses import asdict
-
-from core.models.stock_price import StockPrice, PriceConsensus, PriceValidation
-from core.consensus.streamlet import Block
-
-
-class AAPLPriceSimulator:
-    """Simulates AAPL stock price data from multiple sources."""
-    
-    def __init__(self, base_price: Decimal = Decimal('150.00')):
-        self.base_price = base_price
-        self.current_price = base_price
-        self.volatility = Decimal('0.02')  # 2% volatility
-        self.trend = Decimal('0.001')  # Slight upward trend
-        
-    def generate_price_feed(self, source: str) -> StockPrice:
-        """Generate a simulated price feed for AAPL."""
-        # Add some randomness and trend
-        change = (random.random() - 0.5) * 2 * float(self.volatility) * float(self.current_price)
-        trend_change = float(self.trend) * float(self.current_price)
-        
-        new_price = self.current_price + Decimal(str(change)) + Decimal(str(trend_change))
-        
-        # Ensure price stays within reasonable bounds
-        new_price = max(Decimal('50.00'), min(Decimal('500.00'), new_price))
-        
-        # Generate realistic volume (1000-10000 shares)
-        volume = Decimal(str(random.randint(1000, 10000)))
-        
-        # Update current price
-        self.current_price = new_price
-        
-        return StockPrice.create(
-            symbol="AAPL",
-            price=new_price,
-            volume=volume,
-            source=source
-        )
-
-
-class PriceConsensusService:
-    """Service for aggregating and validating stock prices for consensus."""
-    
-    def __init__(self, symbol: str = "AAPL"):
-        self.symbol = symbol
-        self.validation_rules = PriceValidation.create_aapl_rules()
-        self.price_simulator = AAPLPriceSimulator()
-        self.last_consensus_price: Optional[Decimal] = None
-        
-    def generate_price_feeds(self, num_sources: int = 3) -> List[StockPrice]:
-        """Generate multiple price feeds from different sources."""
-        sources = ["market_data_1", "market_data_2", "external_feed"]
-        feeds = []
-        
-        for i in range(min(num_sources, len(sources))):
-            feed = self.price_simulator.generate_price_feed(sources[i])
-            feeds.append(feed)
-            
-        return feeds
-    
-    def validate_prices(self, prices: List[StockPrice]) -> List[StockPrice]:
-        """Validate prices against rules and previous consensus."""
-        valid_prices = []
-        
-        for price in prices:
-            # Check price bounds
-            if price.price < self.validation_rules.min_price or \
-               price.price > self.validation_rules.max_price:
-                continue
-                
-            # Check volume threshold
-            if price.volume < self.validation_rules.min_volume:
-                continue
-                
-            # Check deviation from last consensus (if available)
-            if self.last_consensus_price:
-                deviation = abs(price.price - self.last_consensus_price) / self.last_consensus_price
-                if deviation > self.validation_rules.max_price_deviation:
-                    continue
-                    
-            valid_prices.append(price)
-            
-        return valid_prices
-    
-    def calculate_consensus_price(self, prices: List[StockPrice]) -> PriceConsensus:
-        """Calculate consensus price using volume-weighted average."""
-        if not prices:
-            raise ValueError("No valid prices provided for consensus")
-            
-        # Calculate volume-weighted average price (VWAP)
-        total_volume = sum(p.volume for p in prices)
-        weighted_sum = sum(p.price * p.volume for p in prices)
-        vwap = weighted_sum / total_volume
-        
-        # Simple average as consensus price (could be median or other method)
-        consensus_price = sum(p.price for p in prices) / len(prices)
-        
-        return PriceConsensus.create(
-            symbol=self.symbol,
-            consensus_price=consensus_price,
-            vwap=vwap,
-            total_volume=total_volume,
-            price_count=len(prices),
-            block_hash=""  # Will be set when block is created
-        )
-    
-    def create_price_block_payload(self, consensus: PriceConsensus) -> bytes:
-        """Create payload for Streamlet block containing price consensus data."""
-        payload_data = {
-            "type": "price_consensus",
-            "symbol": consensus.symbol,
-            "consensus_price": str(consensus.consensus_price),
-            "volume_weighted_price": str(consensus.volume_weighted_price),
-            "total_volume": str(consensus.total_volume),
-            "price_count": consensus.price_count,
-            "timestamp": consensus.timestamp.isoformat()
-        }
-        
-        return json.dumps(payload_data, sort_keys=True).encode('utf-8')
-    
-    def process_epoch_prices(self, epoch: int) -> tuple[bytes, PriceConsensus]:
-        """Process prices for a consensus epoch and return block payload."""
-        # Generate price feeds
-        price_feeds = self.generate_price_feeds()
-        
-        # Validate prices
-        valid_prices = self.validate_prices(price_feeds)
-        
-        # Calculate consensus
-        consensus = self.calculate_consensus_price(valid_prices)
-        
-        # Update last consensus price
-        self.last_consensus_price = consensus.consensus_price
-        
-        # Create block payload
-        payload = self.create_price_block_payload(consensus)
-        
-        return payload, consensus
-
-
-class StockMarketStreamletNode:
-    """Extended Streamlet node for stock market consensus."""
-    
-    def __init__(self, node_id: str, price_service: PriceConsensusService):
-        self.node_id = node_id
-        self.price_service = price_service
-        self.consensus_history: List[PriceConsensus] = []
-        
-    def propose_price_block(self, epoch: int, parent_hash: str) -> Optional[Block]:
-        """Propose a new price consensus block."""
-        try:
-            payload, consensus = self.price_service.process_epoch_prices(epoch)
-            
-            # Create block
-            block = Block(
-                parent_hash=parent_hash,
-                epoch=epoch,
-                proposer_id=self.node_id,
-                payload=payload
-            )
-            
-            # Store consensus data
-            consensus.block_hash = block.hash()
-            self.consensus_history.append(consensus)
-            
-            return block
-            
-        except Exception as e:
-            print(f"Error proposing price block: {e}")
-            return None
-    
-    def get_latest_consensus_price(self) -> Optional[Decimal]:
-        """Get the latest consensus price for the stock."""
-        if self.consensus_history:
-            return self.consensus_history[-1].consensus_price
+"""
+Price consensus service for stock market Streamlet implementation.
+"""
+
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import ClassVar, List, Dict, Optional
+
+import numpy as np
+
+from core.models.stock_price import StockPrice, PriceConsensus, PriceValidation
+from core.consensus.streamlet import Block
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _simulate_walk(price: float, volatility: float, trend: float, n: int) -> np.ndarray:
+    """Advance the AAPL random walk n steps and return the sampled prices."""
+    out = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        change = (np.random.random() - 0.5) * 2.0 * volatility * price
+        price = price + change + trend * price
+        # Ensure price stays within reasonable bounds
+        if price < 50.0:
+            price = 50.0
+        elif price > 500.0:
+            price = 500.0
+        out[i] = price
+    return out
+
+
+if njit is not None:
+    # compile the walk to native code; the kernel is pure float64 math
+    _simulate_walk = njit(cache=True)(_simulate_walk)
+
+
+# Epoch timestamps are derived from the epoch number so every node computes
+# identical consensus data (and hence identical payload bytes and block
+# hashes) without a wall-clock syscall per epoch.
+EPOCH_GENESIS = datetime(2024, 1, 1)
+EPOCH_DURATION = timedelta(seconds=1)
+
+
+class AAPLPriceSimulator:
+    """Simulates AAPL stock price data from multiple sources."""
+    
+    def __init__(self, base_price: Decimal = Decimal('150.00')):
+        self.base_price = base_price
+        # Hot-path state is plain float; Decimal only at the StockPrice boundary
+        self.current_price = float(base_price)
+        self.volatility = 0.02  # 2% volatility
+        self.trend = 0.001  # Slight upward trend
+
+    def generate_price_feed(self, source: str) -> StockPrice:
+        """Generate a simulated price feed for AAPL."""
+        new_price = float(_simulate_walk(self.current_price, self.volatility, self.trend, 1)[0])
+
+        # Generate realistic volume (1000-10000 shares)
+        volume = random.randint(1000, 10000)
+
+        # Update current price
+        self.current_price = new_price
+
+        return StockPrice.create(
+            symbol="AAPL",
+            price=Decimal(str(new_price)),
+            volume=Decimal(volume),
+            source=source
+        )
+
+    def generate_price_feed_batch(self, n: int) -> np.ndarray:
+        """Advance the walk n steps in one kernel call and return the prices.
+
+        Vectorized counterpart of generate_price_feed for bulk sampling;
+        returns raw float64 prices without the per-feed StockPrice boxing
+        (and hence no per-feed source tag).
+        """
+        prices = _simulate_walk(self.current_price, self.volatility, self.trend, n)
+        if n > 0:
+            self.current_price = float(prices[-1])
+        return prices
+
+
+class PriceConsensusService:
+    """Service for aggregating and validating stock prices for consensus."""
+
+    # The rules are the same for every instance, so build them (and the
+    # float copies used by the validation loop) once at class definition
+    # rather than per node.
+    validation_rules: ClassVar[PriceValidation] = PriceValidation.create_aapl_rules()
+    _min_price_f: ClassVar[float] = float(validation_rules.min_price)
+    _max_price_f: ClassVar[float] = float(validation_rules.max_price)
+    _min_volume_f: ClassVar[float] = float(validation_rules.min_volume)
+    _max_deviation_f: ClassVar[float] = float(validation_rules.max_price_deviation)
+
+    def __init__(self, symbol: str = "AAPL"):
+        self.symbol = symbol
+        self.price_simulator = AAPLPriceSimulator()
+        self.last_consensus_price: Optional[Decimal] = None
+
+    def generate_price_feeds(self, num_sources: int = 3) -> List[StockPrice]:
+        """Generate multiple price feeds from different sources."""
+        sources = ["market_data_1", "market_data_2", "external_feed"]
+        feeds = []
+        
+        for i in range(min(num_sources, len(sources))):
+            feed = self.price_simulator.generate_price_feed(sources[i])
+            feeds.append(feed)
+            
+        return feeds
+    
+    def validate_prices(self, prices: List[StockPrice]) -> List[StockPrice]:
+        """Validate prices against rules and previous consensus."""
+        if not prices:
+            return []
+
+        n = len(prices)
+        p = np.fromiter((float(x.price) for x in prices), dtype=np.float64, count=n)
+        v = np.fromiter((float(x.volume) for x in prices), dtype=np.float64, count=n)
+
+        # Price bounds and volume threshold as one fused boolean mask
+        mask = (p >= self._min_price_f) & (p <= self._max_price_f) & (v >= self._min_volume_f)
+
+        # Check deviation from last consensus (if available)
+        if self.last_consensus_price:
+            last = float(self.last_consensus_price)
+            mask &= np.abs(p - last) / last <= self._max_deviation_f
+
+        return [prices[i] for i in np.nonzero(mask)[0]]
+    
+    def calculate_consensus_price(self, prices: List[StockPrice],
+                                  epoch: Optional[int] = None) -> PriceConsensus:
+        """Calculate consensus price using volume-weighted average.
+
+        When an epoch is given the timestamp is derived from it
+        deterministically; otherwise it falls back to wall-clock time.
+        """
+        if not prices:
+            raise ValueError("No valid prices provided for consensus")
+            
+        # Do the statistics in float64; quantize back to Decimal once at the end
+        n = len(prices)
+        prices_arr = np.fromiter((float(p.price) for p in prices), dtype=np.float64, count=n)
+        volumes_arr = np.fromiter((float(p.volume) for p in prices), dtype=np.float64, count=n)
+
+        # Calculate volume-weighted average price (VWAP)
+        total_volume = volumes_arr.sum()
+        vwap = (prices_arr * volumes_arr).sum() / total_volume
+
+        # Simple average as consensus price (could be median or other method)
+        consensus_price = prices_arr.mean()
+
+        return PriceConsensus.create(
+            symbol=self.symbol,
+            consensus_price=Decimal(str(consensus_price)),
+            vwap=Decimal(str(vwap)),
+            total_volume=Decimal(str(total_volume)),
+            price_count=n,
+            block_hash=b"",  # Will be set when block is created
+            timestamp=EPOCH_GENESIS + epoch * EPOCH_DURATION if epoch is not None else None
+        )
+    
+    def create_price_block_payload(self, consensus: PriceConsensus) -> bytes:
+        """Create payload for Streamlet block containing price consensus data."""
+        # The schema is fixed, so emit the JSON bytes directly instead of
+        # building a dict and dispatching through an encoder. Keys stay in
+        # lexicographic order, matching sorted-key serialization.
+        return (
+            b'{"consensus_price":"%b","price_count":%d,"symbol":"%b",'
+            b'"timestamp":"%b","total_volume":"%b","type":"price_consensus",'
+            b'"volume_weighted_price":"%b"}'
+            % (
+                str(consensus.consensus_price).encode(),
+                consensus.price_count,
+                consensus.symbol.encode(),
+                consensus.timestamp.isoformat().encode(),
+                str(consensus.total_volume).encode(),
+                str(consensus.volume_weighted_price).encode(),
+            )
+        )
+    
+    def process_epoch_prices(self, epoch: int) -> tuple[bytes, PriceConsensus]:
+        """Process prices for a consensus epoch and return block payload."""
+        # Generate price feeds
+        price_feeds = self.generate_price_feeds()
+        
+        # Validate prices
+        valid_prices = self.validate_prices(price_feeds)
+        
+        # Calculate consensus
+        consensus = self.calculate_consensus_price(valid_prices, epoch=epoch)
+        
+        # Update last consensus price
+        self.last_consensus_price = consensus.consensus_price
+        
+        # Create block payload
+        payload = self.create_price_block_payload(consensus)
+        
+        return payload, consensus
+
+
+class StockMarketStreamletNode:
+    """Extended Streamlet node for stock market consensus."""
+    
+    def __init__(self, node_id: str, price_service: PriceConsensusService):
+        self.node_id = node_id
+        self.price_service = price_service
+        self.consensus_history: List[PriceConsensus] = []
+        
+    def propose_price_block(self, epoch: int, parent_hash: bytes) -> Optional[Block]:
+        """Propose a new price consensus block."""
+        try:
+            payload, consensus = self.price_service.process_epoch_prices(epoch)
+            
+            # Create block
+            block = Block(
+                parent_hash=parent_hash,
+                epoch=epoch,
+                proposer_id=self.node_id,
+                payload=payload
+            )
+            
+            # Store consensus data
+            consensus.block_hash = block.hash()
+            self.consensus_history.append(consensus)
+            
+            return block
+            
+        except Exception as e:
+            print(f"Error proposing price block: {e}")
+            return None
+    
+    def get_latest_consensus_price(self) -> Optional[Decimal]:
+        """Get the latest consensus price for the stock."""
+        if self.consensus_history:
+            return self.consensus_history[-1].consensus_price
         return None 
\ No newline at end of file
@@ -1,4 +1,5 @@
-from setuptools import setup, find_packages                                                                                                                                                                                                                                                                                               
+from setuptools import setup, find_packages
+
 setup(                                                                                                                                                                          
     name="rsfc_core_dsls",
     version="0.1.0",
@@ -1,55 +1,93 @@
-import argparse
-import os
-import sys
-
-# Ensure imports work regardless of cwd
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-if SCRIPT_DIR not in sys.path:
-    sys.path.insert(0, SCRIPT_DIR)
-
-
-def main():
-    parser = argparse.ArgumentParser(description="Market Sim Scenarios")
-    subparsers = parser.add_subparsers(dest="scenario", help="Scenario to run")
-
-    # Streamlet scenario
-    p_streamlet = subparsers.add_parser("streamlet", help="Run Streamlet consensus demo")
-    p_streamlet.add_argument("--epochs", type=int, default=8, help="Number of epochs to simulate")
-    p_streamlet.add_argument("--plot", action="store_true", default=True, help="Show Plotly visualization (default: on)")
-
-    # Stock Market Consensus scenario
-    p_stock_consensus = subparsers.add_parser("stock-consensus", help="Run stock market consensus demo")
-    p_stock_consensus.add_argument("--epochs", type=int, default=12, help="Number of consensus epochs to run")
-    p_stock_consensus.add_argument("--nodes", type=int, default=4, help="Number of consensus nodes")
-
-    # Consensus Trading scenario
-    p_consensus_trading = subparsers.add_parser("consensus-trading", help="Run consensus-based trading demo")
-    p_consensus_trading.add_argument("--nodes", type=int, default=4, help="Number of consensus nodes")
-
-    # Default to streamlet if no subcommand
-    args, unknown = parser.parse_known_args()
-    scenario = args.scenario or "streamlet"
-
-    if scenario == "streamlet":
-        from simulation.scenarios.streamlet_demo import run_demo
-        # Re-parse for streamlet in case user omitted subcommand
-        if args.scenario is None:
-            dparser = argparse.ArgumentParser(add_help=False)
-            dparser.add_argument("--epochs", type=int, default=8)
-            dparser.add_argument("--plot", action="store_true", default=True)
-            dargs = dparser.parse_args(unknown)
-            run_demo(epochs=dargs.epochs, plot=dargs.plot)
-        else:
-            run_demo(epochs=args.epochs, plot=args.plot)
-    elif scenario == "stock-consensus":
-        from simulation.scenarios.stock_market_consensus_demo import run_stock_market_consensus_demo
-        run_stock_market_consensus_demo(epochs=args.epochs, num_nodes=args.nodes)
-    elif scenario == "consensus-trading":
-        from simulation.scenarios.consensus_trading_demo import run_consensus_trading_demo
-        run_consensus_trading_demo()
-    else:
-        parser.print_help()
-
-
-if __name__ == "__main__":
-    main() 
\ No newline at end of file
+import argparse
+import importlib
+import logging
+import os
+import sys
+
+__version__ = "0.1.0"
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# scenario name -> (module path, entry point); scenario modules are imported
+# only when their scenario is actually run, so one scenario's dependency chain
+# never slows down another's startup
+SCENARIOS = {
+    "streamlet": ("simulation.scenarios.streamlet_demo", "run_demo"),
+    "stock-consensus": ("simulation.scenarios.stock_market_consensus_demo", "run_stock_market_consensus_demo"),
+    "consensus-trading": ("simulation.scenarios.consensus_trading_demo", "run_consensus_trading_demo"),
+}
+
+
+def _load_scenario(name):
+    mod_path, fn_name = SCENARIOS[name]
+    return getattr(importlib.import_module(mod_path), fn_name)
+
+
+def _add_scenario_parser(subparsers, name):
+    if name == "streamlet":
+        p = subparsers.add_parser("streamlet", help="Run Streamlet consensus demo")
+        p.add_argument("--epochs", type=int, default=8, help="Number of epochs to simulate")
+        p.add_argument("--plot", action="store_true", default=True, help="Show Plotly visualization (default: on)")
+        p.add_argument("--offline", action="store_true", help="Inline plotly.js in the plot HTML instead of loading it from the CDN")
+        p.add_argument("--quiet", action="store_true", help="Only log warnings and errors")
+    elif name == "stock-consensus":
+        p = subparsers.add_parser("stock-consensus", help="Run stock market consensus demo")
+        p.add_argument("--epochs", type=int, default=12, help="Number of consensus epochs to run")
+        p.add_argument("--nodes", type=int, default=4, help="Number of consensus nodes")
+        p.add_argument("--quiet", action="store_true", help="Only log warnings and errors")
+    elif name == "consensus-trading":
+        p = subparsers.add_parser("consensus-trading", help="Run consensus-based trading demo")
+        p.add_argument("--nodes", type=int, default=4, help="Number of consensus nodes")
+        p.add_argument("--quiet", action="store_true", help="Only log warnings and errors")
+
+
+def main():
+    argv = sys.argv[1:]
+
+    # Fast path: version info needs no parser construction or scenario imports
+    if argv and argv[0] in ("--version", "-V"):
+        print(__version__)
+        return
+
+    parser = argparse.ArgumentParser(description="Market Sim Scenarios")
+    subparsers = parser.add_subparsers(dest="scenario", help="Scenario to run")
+
+    # Only construct the subparser for the requested scenario; the full set is
+    # needed just for --help or an unrecognized command
+    requested = next((a for a in argv if not a.startswith("-")), None)
+    if requested is None and "-h" not in argv and "--help" not in argv:
+        # Default to streamlet: inject the subcommand and parse once through
+        # the real streamlet subparser, so options like --epochs still take
+        # effect (and unrecognized ones error instead of being ignored)
+        argv = ["streamlet", *argv]
+        requested = "streamlet"
+    if requested in SCENARIOS:
+        _add_scenario_parser(subparsers, requested)
+    else:
+        for name in SCENARIOS:
+            _add_scenario_parser(subparsers, name)
+
+    args = parser.parse_args(argv)
+    scenario = args.scenario
+    if scenario not in SCENARIOS:
+        parser.print_help()
+        return
+    run = _load_scenario(scenario)
+
+    # Scenario progress goes through logging; --quiet drops it to warnings
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO, format="%(message)s")
+
+    if scenario == "streamlet":
+        run(epochs=args.epochs, plot=args.plot, offline=args.offline)
+    elif scenario == "stock-consensus":
+        run(epochs=args.epochs, num_nodes=args.nodes)
+    elif scenario == "consensus-trading":
+        run()
+
+
+if __name__ == "__main__":
+    # Ensure imports work regardless of cwd; only the CLI entry point should
+    # mutate sys.path
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+    main()
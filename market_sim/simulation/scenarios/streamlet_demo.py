@@ -1,79 +1,90 @@
-import argparse
-from typing import List, Dict
-
-from core.consensus.streamlet import StreamletNetwork
-
-try:
-    import plotly.graph_objects as go
-    import plotly.io as pio
-    pio.renderers.default = "browser"
-except Exception:
-    go = None
-
-import webbrowser
-import tempfile
-from pathlib import Path
-
-
-def run_demo(epochs: int = 8, plot: bool = False) -> None:
-    node_ids = ["n1", "n2", "n3", "n4"]
-    net = StreamletNetwork(node_ids=node_ids, f=1)
-
-    print("Running Streamlet demo")
-    print(f"nodes={node_ids}, f=1, quorum=3, epochs={epochs}")
-
-    epoch_to_block_hash = []
-    for e in range(epochs):
-        net.step_epoch(e, f"tx{e}".encode())
-        # capture the block proposed by leader (if any)
-        leader = node_ids[e % len(node_ids)]
-        # get any node's view of the proposed block hash at epoch e
-        node = net.nodes[leader]
-        # find blocks with epoch e
-        bh = None
-        for h, b in node.blocks.items():
-            if b.epoch == e and b.proposer_id == leader:
-                bh = h
-                break
-        epoch_to_block_hash.append(bh)
-
-        # print status
-        tips = {nid: max((net.nodes[nid].notarized_blocks or {None}), key=lambda x: (0 if x is None else len(net.nodes[nid].notarizations.get(x, {"voters": set()}).voters))) for nid in node_ids}
-        finalized_all = net.finalized_by_all()
-        print(f"epoch {e}: leader={leader}, proposed_hash={(bh[:8] if bh else None)}, finalized_common={len(finalized_all)} blocks")
-
-    if plot and go is not None:
-        # Build a simple timeline: epochs vs. whether block got notarized/finalized
-        epochs_list = list(range(epochs))
-        notarized = []
-        finalized = []
-        any_node = next(iter(net.nodes.values()))
-        for e, bh in enumerate(epoch_to_block_hash):
-            if bh is None:
-                notarized.append(0)
-                finalized.append(0)
-                continue
-            notarized.append(1 if bh in any_node.notarized_blocks else 0)
-            finalized.append(1 if bh in net.finalized_by_all() else 0)
-
-        fig = go.Figure()
-        fig.add_trace(go.Bar(name="notarized", x=epochs_list, y=notarized))
-        fig.add_trace(go.Bar(name="finalized\n(committed)", x=epochs_list, y=finalized))
-        fig.update_layout(barmode="group", title="Streamlet: Notarized vs Finalized by Epoch", xaxis_title="Epoch", yaxis_title="Indicator")
-        # Write inline HTML and open in browser (non-blocking, no CDN)
-        html = pio.to_html(fig, include_plotlyjs="inline", full_html=True)
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".html")
-        with open(tmp.name, "w", encoding="utf-8") as f:
-            f.write(html)
-        webbrowser.open(Path(tmp.name).as_uri())
-    elif plot and go is None:
-        print("Plotly not available. Install plotly to enable plotting.")
-
-
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Streamlet demo")
-    parser.add_argument("--epochs", type=int, default=8, help="Number of epochs to simulate")
-    parser.add_argument("--plot", action="store_true", help="Show simple Plotly visualization")
-    args = parser.parse_args()
-
-    run_demo(epochs=args.epochs, plot=args.plot) 
\ No newline at end of file
+import argparse
+import logging
+from typing import List, Dict
+
+from core.consensus.streamlet import StreamletNetwork
+
+log = logging.getLogger(__name__)
+
+
+def run_demo(epochs: int = 8, plot: bool = False, offline: bool = False) -> None:
+    node_ids = ["n1", "n2", "n3", "n4"]
+    net = StreamletNetwork(node_ids=node_ids, f=1)
+
+    log.info("Running Streamlet demo")
+    log.info("nodes=%s, f=1, quorum=3, epochs=%d", node_ids, epochs)
+
+    # Status lines are only formatted when INFO logging is on, and are
+    # buffered and flushed once rather than one write per epoch
+    verbose = log.isEnabledFor(logging.INFO)
+    epoch_to_block_hash = []
+    status_lines = []
+    # Bind the per-epoch lookups to locals once, outside the loop
+    step = net.step_epoch
+    finalized_by_all = net.finalized_by_all
+    record = epoch_to_block_hash.append
+    n_leaders = len(node_ids)
+    for e in range(epochs):
+        # step_epoch reports the leader's proposed block hash directly, so
+        # there is no need to scan any node's block map for it
+        bh = step(e, f"tx{e}".encode())
+        leader = node_ids[e % n_leaders]
+        record(bh)
+
+        if verbose:
+            len_finalized = len(finalized_by_all())
+            status_lines.append(f"epoch {e}: leader={leader}, proposed_hash={(bh.hex()[:8] if bh else None)}, finalized_common={len_finalized} blocks")
+    if verbose:
+        log.info("%s", "\n".join(status_lines))
+
+    if plot:
+        # Plotly pulls in a heavy transitive import chain, so only pay for it
+        # on the plotting path
+        try:
+            import plotly.graph_objects as go
+            import plotly.io as pio
+        except ImportError:
+            log.warning("Plotly not available. Install plotly to enable plotting.")
+            return
+        import tempfile
+        import webbrowser
+        from pathlib import Path
+        pio.renderers.default = "browser"
+
+        # Build a simple timeline: epochs vs. whether block got notarized/finalized
+        epochs_list = list(range(epochs))
+        notarized = []
+        finalized = []
+        any_node = next(iter(net.nodes.values()))
+        finalized_set = net.finalized_by_all()  # computed once, not per epoch
+        for e, bh in enumerate(epoch_to_block_hash):
+            if bh is None:
+                notarized.append(0)
+                finalized.append(0)
+                continue
+            notarized.append(1 if bh in any_node.notarized_blocks else 0)
+            finalized.append(1 if bh in finalized_set else 0)
+
+        fig = go.Figure()
+        fig.add_trace(go.Bar(name="notarized", x=epochs_list, y=notarized))
+        fig.add_trace(go.Bar(name="finalized\n(committed)", x=epochs_list, y=finalized))
+        fig.update_layout(barmode="group", title="Streamlet: Notarized vs Finalized by Epoch", xaxis_title="Epoch", yaxis_title="Indicator")
+        # Loading plotly.js from the CDN keeps the file a few KB; --offline
+        # inlines the ~3 MB library for machines without network access
+        html = pio.to_html(fig, include_plotlyjs="inline" if offline else "cdn", full_html=True)
+        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".html")
+        tmp.close()
+        Path(tmp.name).write_text(html, encoding="utf-8")
+        webbrowser.open(Path(tmp.name).as_uri())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streamlet demo")
+    parser.add_argument("--epochs", type=int, default=8, help="Number of epochs to simulate")
+    parser.add_argument("--plot", action="store_true", help="Show simple Plotly visualization")
+    parser.add_argument("--offline", action="store_true", help="Inline plotly.js in the plot HTML instead of loading it from the CDN")
+    parser.add_argument("--quiet", action="store_true", help="Only log warnings and errors")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO, format="%(message)s")
+    run_demo(epochs=args.epochs, plot=args.plot, offline=args.offline) 
\ No newline at end of file